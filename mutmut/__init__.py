@@ -26,6 +26,7 @@ dunder_whitelist = [
 
 duration_by_test = {}
 stats_time = None
+tests_stamp = None
 config = None
 
 _stats = set()
@@ -1,37 +1,48 @@
 import ast
 import fnmatch
 import gc
-import inspect
 import itertools
 import json
 import os
+import re
 import resource
 import shutil
 import signal
 import sys
 from abc import ABC
-from collections import defaultdict
+from collections import (
+    Counter,
+    defaultdict,
+    deque,
+)
 from configparser import (
     ConfigParser,
     NoOptionError,
     NoSectionError,
 )
 from contextlib import contextmanager
-from dataclasses import dataclass
-from datetime import (
-    datetime,
-    timedelta,
+from dataclasses import (
+    dataclass,
+    field,
 )
 from difflib import unified_diff
 from functools import lru_cache
 from hashlib import md5
-from io import TextIOBase
+from io import (
+    StringIO,
+    TextIOBase,
+)
 from json import JSONDecodeError
 from math import ceil
-from os import (
-    makedirs,
-    walk,
+from multiprocessing import (
+    Pipe,
+    Pool,
 )
+from multiprocessing.connection import (
+    Connection,
+    wait,
+)
+from os import makedirs
 from os.path import (
     isdir,
     isfile,
@@ -42,14 +53,22 @@ from textwrap import (
     dedent,
     indent,
 )
-from threading import Thread
+from threading import (
+    Event,
+    Lock,
+    Thread,
+)
 from time import (
+    monotonic,
     process_time,
     sleep,
 )
 from typing import (
+    Callable,
     Dict,
     List,
+    Match,
+    Optional,
 )
 
 import click
@@ -65,7 +84,6 @@ import mutmut
 # Document: surviving mutants are retested when you ask mutmut to retest them, interactively in the UI or via command line
 
 # TODO: pragma no mutate should end up in `skipped` category
-# TODO: hash of function. If hash changes, retest all mutants as mutant IDs are not stable
 
 
 NEVER_MUTATE_FUNCTION_NAMES = {'__getattribute__', '__setattr__'}
@@ -73,6 +91,7 @@ NEVER_MUTATE_FUNCTION_CALLS = {'isinstance', 'len'}
 CLASS_NAME_SEPARATOR = 'ǁ'
 
 
+# Exit codes not in this table, like a child killed by a signal, are treated as suspicious
 status_by_exit_code = {
     1: 'killed',
     3: 'killed',  # internal error in pytest means a kill
@@ -134,13 +153,31 @@ def guess_paths_to_mutate():
         'Please specify it by adding "paths_to_mutate=code_dir" in setup.cfg to the [mutmut] section.')
 
 
+# code object -> if it's in the test runner, where the stack walk stops. Keyed on the code object, not its id(), so
+# a freed code object's id can't be reused by another one.
+test_runner_code = {}
+
+
+def is_test_runner_code(code):
+    try:
+        return test_runner_code[code]
+    except KeyError:
+        filename = code.co_filename
+        result = test_runner_code[code] = 'pytest' in filename or 'hammett' in filename
+        return result
+
+
 def record_trampoline_hit(name):
     assert not name.startswith('src.'), f'Failed trampoline hit. Module name starts with `src.`, which is invalid'
+    # Functions are typically hit many times per test, skip the stack walk when we already know about this one
+    if name in mutmut._stats:
+        return
+
     if mutmut.config.max_stack_depth != -1:
-        f = inspect.currentframe()
+        f = sys._getframe()
         c = mutmut.config.max_stack_depth
         while c and f:
-            if 'pytest' in f.f_code.co_filename or 'hammett' in f.f_code.co_filename:
+            if is_test_runner_code(f.f_code):
                 break
             f = f.f_back
             c -= 1
@@ -156,16 +193,37 @@ def walk_all_files():
         if not isdir(path):
             if isfile(path):
                 yield '', str(path)
-                continue
-        for root, dirs, files in walk(path):
-            for filename in files:
-                yield root, filename
+            continue
+        yield from walk_directory(str(path))
+
+
+def walk_directory(root):
+    # The scandir entries know if they are directories, so we don't build the per directory lists os.walk does
+    dirs = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                # Like os.walk, a symlink to a directory is a directory, but we don't go into it
+                if not entry.is_symlink():
+                    dirs.append(entry.path)
+            else:
+                yield root, entry.name
+    for d in dirs:
+        yield from walk_directory(d)
 
 
 def walk_source_files():
     for root, filename in walk_all_files():
         if filename.endswith('.py'):
-            yield Path(root) / filename
+            # One Path built from both parts, instead of a Path for the directory that is then joined
+            yield Path(root, filename)
+
+
+@lru_cache(maxsize=None)
+def list_source_files():
+    # Several steps of a command go through the source files, so only walk the tree once. If files
+    # can have been added since, like when browse has run mutmut again, call list_source_files.cache_clear()
+    return tuple(walk_source_files())
 
 
 class InvalidMutantException(Exception):
@@ -184,6 +242,10 @@ class BadTestExecutionCommandsException(Exception):
     pass
 
 
+class InvalidConfigException(Exception):
+    pass
+
+
 # noinspection PyUnresolvedReferences
 # language=python
 trampoline_impl = """
@@ -212,16 +274,45 @@ def _mutmut_trampoline(orig, mutants, *args, **kwargs):
 yield_from_trampoline_impl = trampoline_impl.replace('result = ', 'result = yield from ').replace('_mutmut_trampoline', '_mutmut_yield_from_trampoline')
 
 
-def create_mutants():
-    for path in walk_source_files():
-        print(path)
-        output_path = Path('mutants') / path
-        makedirs(output_path.parent, exist_ok=True)
+def init_create_mutants_worker(config):
+    # Set up the worker once, instead of per file. Needed where workers are spawned and don't inherit our state.
+    mutmut.config = config
 
-        if mutmut.config.should_ignore_for_mutation(path):
-            shutil.copy(path, output_path)
-        else:
-            create_mutants_for_file(path, output_path)
+
+def create_mutants(max_children=None):
+    # Files that haven't changed since the last run don't need a round trip to a worker just to be skipped
+    paths = [
+        path
+        for path in list_source_files()
+        if mutmut.config.should_ignore_for_mutation(path) or not mutants_file_up_to_date(path, Path('mutants') / path)
+    ]
+    # Start with the biggest files, so a slow file doesn't end up last keeping a single worker busy. That's also
+    # why chunksize is 1: chunks would hand the biggest files to the same worker.
+    paths.sort(key=lambda path: path.stat().st_size, reverse=True)
+    with Pool(processes=max_children, initializer=init_create_mutants_worker, initargs=(mutmut.config,)) as pool:
+        try:
+            for path in pool.imap_unordered(create_file_mutants, paths, chunksize=1):
+                print(path)
+        except InvalidMutantException as e:
+            print(e)
+            exit(1)
+
+
+def create_file_mutants(path):
+    output_path = Path('mutants') / path
+    makedirs(output_path.parent, exist_ok=True)
+
+    if mutmut.config.should_ignore_for_mutation(path):
+        # Not mutated, so like the also_copy files, only copied when it changed. It can't be a hard link instead:
+        # the tests run in mutants/ and anything they write to it would end up in the source tree.
+        copy_if_changed(path, output_path)
+        # The copy has the mtime of the source, so only the missing .meta tells mutants_file_up_to_date() that it
+        # isn't mutated, if the file is taken out of do_not_mutate again
+        Path(str(output_path) + '.meta').unlink(missing_ok=True)
+        Path(str(output_path) + '.meta.journal').unlink(missing_ok=True)
+    else:
+        create_mutants_for_file(path, output_path)
+    return path
 
 
 def copy_also_copy_files():
@@ -233,9 +324,22 @@ def copy_also_copy_files():
         if not path.exists():
             continue
         if path.is_file():
-            shutil.copy(path, destination)
+            copy_if_changed(path, destination)
         else:
-            shutil.copytree(path, destination, dirs_exist_ok=True)
+            shutil.copytree(path, destination, dirs_exist_ok=True, copy_function=copy_if_changed)
+
+
+def copy_if_changed(src, dst):
+    # copy2 keeps the modification time, so a file we copied on a previous run and that is unchanged since is skipped
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        pass
+    else:
+        if src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+            return dst
+    return shutil.copy2(src, dst)
 
 
 def pragma_no_mutate_lines(source):
@@ -246,36 +350,77 @@ def pragma_no_mutate_lines(source):
     }
 
 
+def mutants_file_up_to_date(filename, output_path):
+    # The mutants file gets the mtime of the source it was made from. A plain copy of a file excluded from mutation
+    # has that mtime too, but no .meta.
+    try:
+        return os.stat(output_path).st_mtime == os.stat(filename).st_mtime and os.path.exists(str(output_path) + '.meta')
+    except FileNotFoundError:
+        return False
+
+
 def create_mutants_for_file(filename, output_path):
     input_stat = os.stat(filename)
 
-    if output_path.exists() and output_path.stat().st_mtime == input_stat.st_mtime:
+    if mutants_file_up_to_date(filename, output_path):
         # print('    skipped', output_path, 'already up to date')
         return
 
-    with open(filename) as f:
+    with open(filename, encoding='utf-8') as f:
         source = f.read()
+    source_hash = md5(source.encode()).hexdigest()
+
+    previous_source_file_mutation_data = SourceFileMutationData(path=filename)
+    previous_source_file_mutation_data.load()
+    if output_path.exists() and previous_source_file_mutation_data.source_hash == source_hash:
+        # Only the mtime changed, like after a git checkout, so the mutants and their results are still good
+        os.utime(output_path, (input_stat.st_atime, input_stat.st_mtime))
+        return
 
-    with open(output_path, 'w') as out:
+    out = StringIO()
+    # parso makes an object per node, and they all stay alive until we're done with the tree. Collecting while the
+    # tree is built only walks them over and over, so leave that until after.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
         mutant_names, hash_by_function_name = write_all_mutants_to_file(out=out, source=source, filename=filename)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    # Encoded once: writing the text and ast.parse would each encode it otherwise
+    mutated_source = out.getvalue().encode('utf-8')
+
+    with open(output_path, 'wb') as f:
+        f.write(mutated_source)
 
     # validate no syntax errors of mutants
-    with open(output_path) as f:
-        try:
-            ast.parse(f.read())
-        except (IndentationError, SyntaxError) as e:
-            print(output_path, 'has invalid syntax: ', e)
-            exit(1)
+    try:
+        ast.parse(mutated_source, filename=str(output_path))
+    except (IndentationError, SyntaxError) as e:
+        raise InvalidMutantException(f'{output_path} has invalid syntax: {e}')
 
-    source_file_mutation_data = SourceFileMutationData(path=filename)
-    module_name = strip_prefix(str(filename)[:-len(filename.suffix)].replace(os.sep, '.'), prefix='src.')
+    # Mutants of a function that hasn't changed are the same as last time, so their results still stand
+    previous_hash_by_function_name = previous_source_file_mutation_data.hash_by_function_name
 
-    source_file_mutation_data.exit_code_by_key = {
-         '.'.join([module_name, x]).replace('.__init__.', '.'): None
-        for x in mutant_names
-    }
+    source_file_mutation_data = SourceFileMutationData(path=filename)
+    parts = filename.with_suffix('').parts
+    if len(parts) > 1 and parts[0] == 'src':
+        parts = parts[1:]
+    # Stored normalized, so run doesn't have to strip '__init__' from every mutant name. The functions of a package's
+    # __init__.py belong to the package, like their __module__ says.
+    if parts[-1] == '__init__':
+        parts = parts[:-1]
+    prefix = ''.join(part + '.' for part in parts)
+    for x in mutant_names:
+        key = prefix + x
+        function_name = x.rpartition('__mutmut_')[0]
+        if previous_hash_by_function_name.get(function_name, '') == hash_by_function_name.get(function_name):
+            source_file_mutation_data.exit_code_by_key[key] = previous_source_file_mutation_data.exit_code_by_key.get(key)
+        else:
+            source_file_mutation_data.exit_code_by_key[key] = None
     source_file_mutation_data.hash_by_function_name = hash_by_function_name
     assert None not in hash_by_function_name
+    source_file_mutation_data.source_hash = source_hash
     source_file_mutation_data.save()
 
     os.utime(output_path, (input_stat.st_atime, input_stat.st_mtime))
@@ -500,7 +645,7 @@ def yield_mutants_for_function(node, *, class_name=None, no_mutate_lines):
     orig_name = node.name.value
     # noinspection PyArgumentList
     with rename_function_node(node, suffix='orig', class_name=class_name):
-        yield 'orig', node.get_code(), (orig_name, hash_of_orig), None
+        yield 'orig', node.get_code(), (mangle_function_name(name=orig_name, class_name=class_name), hash_of_orig), None
 
     context = FuncContext(no_mutate_lines=no_mutate_lines)
 
@@ -590,10 +735,15 @@ class SourceFileMutationData:
         self.estimated_time_of_tests_by_mutant = {}
         self.path = path
         self.meta_path = Path('mutants') / (str(path) + '.meta')
+        self.journal_path = Path('mutants') / (str(path) + '.meta.journal')
+        self.journal = None
+        # The journal is written from the main thread and flushed from the journal flusher thread
+        self.journal_lock = Lock()
         self.meta = None
         self.key_by_pid = {}
         self.exit_code_by_key = {}
         self.hash_by_function_name = {}
+        self.source_hash = None
         self.start_time_by_pid = {}
         self.estimated_time_of_tests_by_pid = {}
 
@@ -606,31 +756,101 @@ class SourceFileMutationData:
 
         self.exit_code_by_key = self.meta.pop('exit_code_by_key')
         self.hash_by_function_name = self.meta.pop('hash_by_function_name')
+        # Meta files from before source_hash was added don't have it, they just don't match any source
+        self.source_hash = self.meta.pop('source_hash', None)
         assert not self.meta, self.meta  # We should read all the data!
 
-    def register_pid(self, *, pid, key, estimated_time_of_tests):
+        self.replay_journal()
+
+    def replay_journal(self):
+        # Results registered since the last save() are in the journal, one JSON line per result
+        try:
+            with open(self.journal_path) as f:
+                for line in f:
+                    try:
+                        key, exit_code = json.loads(line)
+                    except JSONDecodeError:
+                        # A partially written last line, from a run that was killed
+                        break
+                    if key in self.exit_code_by_key:
+                        self.exit_code_by_key[key] = exit_code
+        except FileNotFoundError:
+            pass
+
+    def register_pid(self, *, pid, key, estimated_time_of_tests, start_time=None):
         self.key_by_pid[pid] = key
-        self.start_time_by_pid[pid] = datetime.now()
         self.estimated_time_of_tests_by_pid[pid] = estimated_time_of_tests
+        # Set last: the timeout checker thread looks at pids with a start time
+        self.start_time_by_pid[pid] = monotonic() if start_time is None else start_time
 
     def register_result(self, *, pid, exit_code):
         assert self.key_by_pid[pid] in self.exit_code_by_key
-        self.exit_code_by_key[self.key_by_pid[pid]] = exit_code
-        # TODO: maybe rate limit this? Saving on each result can slow down mutation testing a lot if the test run is fast.
+        self.register_exit_code(key=self.key_by_pid[pid], exit_code=exit_code)
         del self.key_by_pid[pid]
         del self.start_time_by_pid[pid]
-        self.save()
+
+    def register_exit_code(self, *, key, exit_code):
+        self.exit_code_by_key[key] = exit_code
+        # Rewriting the entire meta file for each result is O(N^2) over a run, so append to the journal instead.
+        # The journal is folded back into the meta file by save(), and written to disk by flush_journal()
+        line = json.dumps([key, exit_code]) + '\n'
+        with self.journal_lock:
+            if self.journal is None:
+                # flush_journal() writes it out every second anyway, so buffer more than the default for fewer writes
+                self.journal = open(self.journal_path, 'a', buffering=128 * 1024)
+            self.journal.write(line)
+
+    def flush_journal(self):
+        with self.journal_lock:
+            if self.journal is not None:
+                self.journal.flush()
 
     def stop_children(self):
         for pid in self.key_by_pid.keys():
             os.kill(pid, SIGTERM)
 
     def save(self):
-        with open(self.meta_path, 'w') as f:
-            json.dump(dict(
-                exit_code_by_key=self.exit_code_by_key,
-                hash_by_function_name=self.hash_by_function_name,
-            ), f, indent=4)
+        # No indent: json only uses its C encoder for compact output. Serialize first, so it's written in one go.
+        data = json.dumps(dict(
+            exit_code_by_key=self.exit_code_by_key,
+            hash_by_function_name=self.hash_by_function_name,
+            source_hash=self.source_hash,
+        ), separators=(',', ':'))
+        tmp_path = Path(str(self.meta_path) + '.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, self.meta_path)
+
+        # Everything in the journal is now in the meta file
+        with self.journal_lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            self.journal_path.unlink(missing_ok=True)
+
+
+# path -> (file_stat_key of the meta and journal files, SourceFileMutationData loaded from them)
+source_file_mutation_data_cache = {}
+
+
+def file_stat_key(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_source_file_mutation_data(path):
+    # For read only use: browse looks up a mutant on every cursor move, so only parse files that changed on disk
+    m = SourceFileMutationData(path=path)
+    key = file_stat_key(m.meta_path), file_stat_key(m.journal_path)
+    cached = source_file_mutation_data_cache.get(str(path))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    m.load()
+    source_file_mutation_data_cache[str(path)] = key, m
+    return m
 
 
 def unused(*_):
@@ -645,10 +865,13 @@ def strip_prefix(s, *, prefix, strict=False):
 
 
 class TestRunner(ABC):
+    # Runners that implement run_tests_in_worker() get their tests collected once per worker, instead of once per mutant
+    supports_workers = False
+
     def run_stats(self, *, tests):
         raise NotImplementedError()
 
-    def run_forced_fail(self):
+    def run_forced_fail(self, *, tests):
         raise NotImplementedError()
 
     def prepare_main_test_run(self):
@@ -657,6 +880,11 @@ class TestRunner(ABC):
     def run_tests(self, *, mutant_name, tests):
         raise NotImplementedError()
 
+    def run_tests_in_worker(self, *, tests, jobs, report_result):
+        # Call report_result(exit_code, killed_by=test_name) for each job. killed_by is optional, the worker uses it to
+        # run that test first for other mutants of the same function.
+        raise NotImplementedError()
+
     def list_all_tests(self):
         raise NotImplementedError()
 
@@ -681,12 +909,15 @@ class ListAllTestsResult:
         self.ids = ids
 
     def clear_out_obsolete_test_names(self):
-        count_before = sum(len(x) for x in mutmut.tests_by_mangled_function_name)
-        mutmut.tests_by_mangled_function_name = defaultdict(set, **{
-            k: {test_name for test_name in test_names if test_name in self.ids}
-            for k, test_names in mutmut.tests_by_mangled_function_name.items()
-        })
-        count_after = sum(len(x) for x in mutmut.tests_by_mangled_function_name)
+        if self.ids.issuperset(itertools.chain.from_iterable(mutmut.tests_by_mangled_function_name.values())):
+            return
+
+        count_before = sum(map(len, mutmut.tests_by_mangled_function_name.values()))
+        for test_names in mutmut.tests_by_mangled_function_name.values():
+            test_names.intersection_update(self.ids)
+        for k in [k for k, test_names in mutmut.tests_by_mangled_function_name.items() if not test_names]:
+            del mutmut.tests_by_mangled_function_name[k]
+        count_after = sum(map(len, mutmut.tests_by_mangled_function_name.values()))
         if count_before != count_after:
             print(f'Removed {count_before - count_after} obsolete test names')
             save_stats()
@@ -696,6 +927,8 @@ class ListAllTestsResult:
 
 
 class PytestRunner(TestRunner):
+    supports_workers = True
+
     # noinspection PyMethodMayBeStatic
     def execute_pytest(self, params, **kwargs):
         import pytest
@@ -715,8 +948,9 @@ class PytestRunner(TestRunner):
             # noinspection PyMethodMayBeStatic
             def pytest_runtest_teardown(self, item, nextitem):
                 unused(nextitem)
+                test_name = strip_prefix(item._nodeid, prefix='mutants/')
                 for function in mutmut._stats:
-                    mutmut.tests_by_mangled_function_name[function].add(strip_prefix(item._nodeid, prefix='mutants/'))
+                    mutmut.tests_by_mangled_function_name[function].add(test_name)
                 mutmut._stats.clear()
 
             # noinspection PyMethodMayBeStatic
@@ -732,9 +966,53 @@ class PytestRunner(TestRunner):
         with change_cwd('mutants'):
             return int(self.execute_pytest(['-x', '-q', '--import-mode=append'] + list(tests)))
 
-    def run_forced_fail(self):
+    def run_tests_in_worker(self, *, tests, jobs, report_result):
+        class WorkerLoop:
+            def __init__(self):
+                self.failed_test = None
+
+            def pytest_runtest_logreport(self, report):
+                if report.failed and self.failed_test is None:
+                    self.failed_test = report.nodeid
+
+            def pytest_runtestloop(self, session):
+                # Tests are collected once, then we switch mutant for each job. Mutants with disjoint tests are not
+                # combined into one pass over the tests: MUTANT_UNDER_TEST only holds one mutant, and a test can call
+                # other mutated functions than the ones it's listed for, so each mutant gets its own pass.
+                item_by_nodeid = {item.nodeid: item for item in session.items}
+                for mutant_name, tests_of_mutant in jobs:
+                    os.environ['MUTANT_UNDER_TEST'] = mutant_name
+                    items = [item_by_nodeid[test_name] for test_name in tests_of_mutant if test_name in item_by_nodeid]
+                    if not items:
+                        report_result(33)
+                        continue
+
+                    self.failed_test = None
+                    # Fixtures shared by the mutant's tests are set up once. After its last test, nextitem=None tears
+                    # down all fixtures, so nothing carries over to the next mutant.
+                    for item, nextitem in zip(items, items[1:] + [None]):
+                        item.ihook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+                        if self.failed_test is not None:
+                            break
+                    if self.failed_test is not None:
+                        if nextitem is not None:
+                            # We stopped early, the fixtures kept for the next test have to go too. The test failed
+                            # already, so the mutant is killed whatever the teardown does.
+                            try:
+                                session._setupstate.teardown_exact(None)
+                            except Exception:
+                                pass
+                        report_result(1, killed_by=self.failed_test)
+                    else:
+                        report_result(0)
+                return True
+
         with change_cwd('mutants'):
-            return int(self.execute_pytest(['-x', '-q', '--import-mode=append']))
+            return int(self.execute_pytest(['-q', '--import-mode=append'] + list(tests), plugins=[WorkerLoop()]))
+
+    def run_forced_fail(self, *, tests):
+        with change_cwd('mutants'):
+            return int(self.execute_pytest(['-x', '-q', '--import-mode=append'] + list(tests)))
 
     def list_all_tests(self):
         class TestsCollector:
@@ -751,12 +1029,18 @@ class PytestRunner(TestRunner):
         return ListAllTestsResult(ids=collector.nodeids)
 
 
+@lru_cache()
+def import_hammett():
+    import hammett
+    return hammett
+
+
 class HammettRunner(TestRunner):
     def __init__(self):
         self.hammett_kwargs = None
 
     def run_stats(self, *, tests):
-        import hammett
+        hammett = import_hammett()
         print('Running hammett stats...')
 
         def post_test_callback(_name, **_):
@@ -766,12 +1050,12 @@ class HammettRunner(TestRunner):
 
         return hammett.main(quiet=True, fail_fast=True, disable_assert_analyze=True, post_test_callback=post_test_callback, use_cache=False, insert_cwd=False)
 
-    def run_forced_fail(self):
-        import hammett
+    def run_forced_fail(self, *, tests):
+        hammett = import_hammett()
         return hammett.main(quiet=True, fail_fast=True, disable_assert_analyze=True, use_cache=False, insert_cwd=False)
 
     def prepare_main_test_run(self):
-        import hammett
+        hammett = import_hammett()
         self.hammett_kwargs = hammett.main_setup(
             quiet=True,
             fail_fast=True,
@@ -781,7 +1065,7 @@ class HammettRunner(TestRunner):
         )
 
     def run_tests(self, *, mutant_name, tests):
-        import hammett
+        hammett = import_hammett()
         hammett.Config.workerinput = dict(workerinput=f'_{mutant_name}')
         return hammett.main_run_tests(**self.hammett_kwargs, tests=tests)
 
@@ -796,18 +1080,19 @@ def mangle_function_name(*, name, class_name):
     return f'{prefix}{name}'
 
 
+@lru_cache(maxsize=None)
 def mangled_name_from_mutant_name(mutant_name):
     assert '__mutmut_' in mutant_name, mutant_name
     return mutant_name.partition('__mutmut_')[0]
 
 
+@lru_cache(maxsize=None)
 def orig_function_and_class_names_from_key(mutant_name):
     r = mangled_name_from_mutant_name(mutant_name)
     _, _, r = r.rpartition('.')
     class_name = None
     if CLASS_NAME_SEPARATOR in r:
-        class_name = r[r.index(CLASS_NAME_SEPARATOR) + 1: r.rindex(CLASS_NAME_SEPARATOR)]
-        r = r[r.rindex(CLASS_NAME_SEPARATOR) + 1:]
+        _, class_name, r = r.split(CLASS_NAME_SEPARATOR)
     else:
         assert r.startswith('x_'), r
         r = r[2:]
@@ -823,14 +1108,21 @@ def status_printer():
     .. note::
         If the string is longer than a line, then in-place updating may not
         work (it will print a new line at each refresh).
+
+    The string can also be given as a function, so it is only built when
+    it is printed.
     """
     last_len = [0]
-    last_update = [datetime(1900, 1, 1)]
-    update_threshold = timedelta(seconds=0.1)
+    last_update = [0.0]
+    update_threshold = 0.1
 
     def p(s, *, force_output=False):
-        if not force_output and (datetime.now() - last_update[0]) < update_threshold:
+        now = monotonic()
+        if not force_output and (now - last_update[0]) < update_threshold:
             return
+        last_update[0] = now
+        if callable(s):
+            s = s()
         s = next(spinner) + ' ' + s
         len_s = len(s)
         output = '\r' + s + (' ' * max(last_len[0] - len_s, 0))
@@ -856,45 +1148,49 @@ class Stat:
     check_was_interrupted_by_user: int
 
 
-def collect_stat(m: SourceFileMutationData):
-    r = {
-        k.replace(' ', '_'): 0
-        for k in status_by_exit_code.values()
-    }
-    for k, v in m.exit_code_by_key.items():
-        # noinspection PyTypeChecker
-        r[status_by_exit_code[v].replace(' ', '_')] += 1
+stat_field_by_exit_code = {
+    exit_code: status.replace(' ', '_')
+    for exit_code, status in status_by_exit_code.items()
+}
+
+
+stat_fields = tuple(status.replace(' ', '_') for status in emoji_by_status)
+
+
+def stat_from_exit_codes(exit_codes):
+    r = dict.fromkeys(stat_fields, 0)
+    for exit_code, count in Counter(exit_codes).items():
+        r[stat_field_by_exit_code.get(exit_code, 'suspicious')] += count
     return Stat(
         **r,
         total=sum(r.values()),
     )
 
 
+def collect_stat(m: SourceFileMutationData):
+    return stat_from_exit_codes(m.exit_code_by_key.values())
+
+
 def calculate_summary_stats(source_file_mutation_data_by_path):
-    stats = [collect_stat(x) for x in source_file_mutation_data_by_path.values()]
-    return Stat(
-        not_checked=sum(x.not_checked for x in stats),
-        killed=sum(x.killed for x in stats),
-        survived=sum(x.survived for x in stats),
-        total=sum(x.total for x in stats),
-        no_tests=sum(x.no_tests for x in stats),
-        skipped=sum(x.skipped for x in stats),
-        suspicious=sum(x.suspicious for x in stats),
-        timeout=sum(x.timeout for x in stats),
-        check_was_interrupted_by_user=sum(x.check_was_interrupted_by_user for x in stats),
-    )
+    return stat_from_exit_codes(itertools.chain.from_iterable(
+        m.exit_code_by_key.values()
+        for m in source_file_mutation_data_by_path.values()
+    ))
 
 
 def print_stats(source_file_mutation_data_by_path, force_output=False):
-    s = calculate_summary_stats(source_file_mutation_data_by_path)
-    print_status(f'{(s.total - s.not_checked)}/{s.total}  🎉 {s.killed} 🫥 {s.no_tests}  ⏰ {s.timeout}  🤔 {s.suspicious}  🙁 {s.survived}  🔇 {s.skipped}', force_output=force_output)
+    # This is called for every mutant, but counting goes through all results, so only do it when the line is redrawn
+    def status():
+        s = calculate_summary_stats(source_file_mutation_data_by_path)
+        return f'{(s.total - s.not_checked)}/{s.total}  🎉 {s.killed} 🫥 {s.no_tests}  ⏰ {s.timeout}  🤔 {s.suspicious}  🙁 {s.survived}  🔇 {s.skipped}'
+    print_status(status, force_output=force_output)
 
 
-def run_forced_fail(runner):
+def run_forced_fail(runner, tests=()):
     os.environ['MUTANT_UNDER_TEST'] = 'fail'
     with CatchOutput(spinner_title='Running forced fail test') as catcher:
         try:
-            if runner.run_forced_fail() == 0:
+            if runner.run_forced_fail(tests=tests) == 0:
                 catcher.dump_output()
                 print("FAILED")
                 os._exit(1)
@@ -905,8 +1201,9 @@ def run_forced_fail(runner):
 
 
 class CatchOutput:
-    def __init__(self, callback=lambda s: None, spinner_title=None):
-        self.strings = []
+    def __init__(self, callback=lambda s: None, spinner_title=None, max_strings=None):
+        # With max_strings, only the last writes are kept, so a chatty test suite can't make us run out of memory
+        self.strings = deque(maxlen=max_strings)
         self.spinner_title = spinner_title or ''
 
         class StdOutRedirect(TextIOBase):
@@ -949,6 +1246,15 @@ class CatchOutput:
             print()
 
 
+def has_fnmatch_wildcards(s):
+    return '*' in s or '?' in s or '[' in s
+
+
+def compile_fnmatch_patterns(patterns):
+    # fnmatch translates and compiles the pattern on each call, so do that once for all patterns
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns)).match
+
+
 @dataclass
 class Config:
     also_copy: List[Path]
@@ -956,14 +1262,27 @@ class Config:
     max_stack_depth: int
     debug: bool
     paths_to_mutate: List[Path]
+    mutants_per_child: int
+    do_not_mutate_match: Optional[Callable[[str], Optional[Match]]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # 0 would never give a worker a mutant to run, and a negative number would never replace it
+        if self.mutants_per_child < 1:
+            raise InvalidConfigException(f'mutants_per_child must be 1 or more, got {self.mutants_per_child}')
+
+        # The config doesn't change during a run, so we decide up front if there is anything to match at all
+        if self.do_not_mutate:
+            self.do_not_mutate_match = compile_fnmatch_patterns(self.do_not_mutate)
+        else:
+            self.do_not_mutate_match = None
 
     def should_ignore_for_mutation(self, path):
-        if not str(path).endswith('.py'):
+        path = str(path)
+        if not path.endswith('.py'):
             return True
-        for p in self.do_not_mutate:
-            if fnmatch.fnmatch(path, p):
-                return True
-        return False
+        if self.do_not_mutate_match is None:
+            return False
+        return self.do_not_mutate_match(path) is not None
 
 
 def config_reader():
@@ -1027,6 +1346,7 @@ def read_config():
         ] + list(Path('.').glob('test*.py')),
         max_stack_depth=s('max_stack_depth', -1),
         debug=s('debug', False),
+        mutants_per_child=s('mutants_per_child', 1),
         paths_to_mutate=[
             Path(y)
             for y in s('paths_to_mutate', [])
@@ -1065,12 +1385,45 @@ def run_stats_collection(runner, tests=None):
     save_stats()
 
 
+def mutants_tests_stamp():
+    # Collecting the tests happens in mutants/, on the files we copied there. They keep the mtime of their source, so if
+    # none of them changed, neither did the list of tests. Whatever else is in mutants/, like the caches and reports a
+    # test run leaves, isn't looked at.
+    stamp = md5()
+    for path in mutmut.config.paths_to_mutate + mutmut.config.also_copy:
+        path = os.path.join('mutants', path)
+        if isdir(path):
+            files = walk_directory(path)
+        else:
+            files = [os.path.split(path)]
+        for root, filename in files:
+            if '__pycache__' in root or '.pytest_cache' in root:
+                continue
+            # Our own files, next to the mutants
+            if filename.endswith(('.meta', '.meta.journal', '.meta.tmp')):
+                continue
+            if os.path.normpath(root) == 'mutants' and filename.startswith('mutmut-'):
+                continue
+            file_path = os.path.join(root, filename)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            stamp.update(f'{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n'.encode())
+    return stamp.hexdigest()
+
+
 def collect_or_load_stats(runner):
     did_load = load_stats()
+    tests_stamp = mutants_tests_stamp()
 
     if not did_load:
         # Run full stats
+        mutmut.tests_stamp = tests_stamp
         run_stats_collection(runner)
+    elif tests_stamp == mutmut.tests_stamp:
+        # Nothing changed since the tests were last listed, so skip starting pytest just to list them again
+        pass
     else:
         # Run incremental stats
         with CatchOutput(spinner_title='Listing all tests') as output_catcher:
@@ -1086,9 +1439,12 @@ def collect_or_load_stats(runner):
 
         new_tests = all_tests_result.new_tests()
 
+        mutmut.tests_stamp = tests_stamp
         if new_tests:
             print(f'Found {len(new_tests)} new tests, rerunning stats collection')
             run_stats_collection(runner, tests=new_tests)
+        else:
+            save_stats()
 
 
 def load_stats():
@@ -1096,10 +1452,17 @@ def load_stats():
     try:
         with open('mutants/mutmut-stats.json') as f:
             data = json.load(f)
-            for k, v in data.pop('tests_by_mangled_function_name').items():
-                mutmut.tests_by_mangled_function_name[k] |= set(v)
+            tests_by_mangled_function_name = data.pop('tests_by_mangled_function_name')
+            if not mutmut.tests_by_mangled_function_name:
+                # The usual case: nothing to merge with, so build it in one go
+                mutmut.tests_by_mangled_function_name = defaultdict(set, {k: set(v) for k, v in tests_by_mangled_function_name.items()})
+            else:
+                for k, v in tests_by_mangled_function_name.items():
+                    mutmut.tests_by_mangled_function_name[k].update(v)
             mutmut.duration_by_test = data.pop('duration_by_test')
             mutmut.stats_time = data.pop('stats_time')
+            # Stats files from before tests_stamp was added don't have it, so the tests are listed again
+            mutmut.tests_stamp = data.pop('tests_stamp', None)
             assert not data, data
             did_load = True
     except (FileNotFoundError, JSONDecodeError):
@@ -1108,18 +1471,22 @@ def load_stats():
 
 
 def save_stats():
+    # Like SourceFileMutationData.save(): compact, so json uses its C encoder, and serialized first so it's written in one go.
+    # The sets of tests are turned into lists by default=list as they're encoded, instead of copying the whole dict first.
+    data = json.dumps(dict(
+        tests_by_mangled_function_name=mutmut.tests_by_mangled_function_name,
+        duration_by_test=mutmut.duration_by_test,
+        stats_time=mutmut.stats_time,
+        tests_stamp=mutmut.tests_stamp,
+    ), separators=(',', ':'), default=list)
     with open('mutants/mutmut-stats.json', 'w') as f:
-        json.dump(dict(
-            tests_by_mangled_function_name={k: list(v) for k, v in mutmut.tests_by_mangled_function_name.items()},
-            duration_by_test=mutmut.duration_by_test,
-            stats_time=mutmut.stats_time,
-        ), f, indent=4)
+        f.write(data)
 
 
 def collect_source_file_mutation_data(*, mutant_names):
     source_file_mutation_data_by_path: Dict[str, SourceFileMutationData] = {}
 
-    for path in walk_source_files():
+    for path in list_source_files():
         if mutmut.config.should_ignore_for_mutation(path):
             continue
         assert path not in source_file_mutation_data_by_path
@@ -1134,19 +1501,36 @@ def collect_source_file_mutation_data(*, mutant_names):
     ]
 
     if mutant_names:
-        filtered_mutants = [
-            (m, key, result)
-            for m, key, result in mutants
-            if key in mutant_names or any(fnmatch.fnmatch(key, mutant_name) for mutant_name in mutant_names)
-        ]
+        # Exact names are a set lookup, so only the patterns need the regex. Often there are none, like when browse
+        # retests a single mutant.
+        mutant_names_set = {x for x in mutant_names if not has_fnmatch_wildcards(x)}
+        patterns = [x for x in mutant_names if has_fnmatch_wildcards(x)]
+        if patterns:
+            mutant_name_match = compile_fnmatch_patterns(patterns)
+            filtered_mutants = [
+                (m, key, result)
+                for m, key, result in mutants
+                if key in mutant_names_set or mutant_name_match(key)
+            ]
+        else:
+            filtered_mutants = [
+                (m, key, result)
+                for m, key, result in mutants
+                if key in mutant_names_set
+            ]
         assert filtered_mutants, f'Filtered for specific mutants, but nothing matches\n\nFilter: {mutant_names}'
         mutants = filtered_mutants
     return mutants, source_file_mutation_data_by_path
 
 
 def estimated_worst_case_time(mutant_name):
-    tests = mutmut.tests_by_mangled_function_name.get(mangled_name_from_mutant_name(mutant_name), set())
-    return sum(mutmut.duration_by_test[t] for t in tests)
+    return estimated_worst_case_time_for_function(mangled_name_from_mutant_name(mutant_name))
+
+
+@lru_cache(maxsize=None)
+def estimated_worst_case_time_for_function(mangled_name):
+    # All mutants of a function run the same tests, so sum their durations once per function
+    return sum(map(mutmut.duration_by_test.__getitem__, fastest_tests_first_for_function(mangled_name)))
 
 
 @cli.command()
@@ -1191,16 +1575,27 @@ def stop_all_children(mutants):
         m.stop_children()
 
 
-def timeout_checker(mutants):
+def journal_flusher(source_file_mutation_data_by_path, stop_event):
+    def inner_journal_flusher():
+        # Results hit the disk at most once per second, instead of once per mutant
+        while not stop_event.wait(1):
+            for m in source_file_mutation_data_by_path.values():
+                m.flush_journal()
+    return inner_journal_flusher
+
+
+def timeout_checker(source_file_mutation_data_by_path):
     def inner_timout_checker():
         while True:
             sleep(1)
 
-            now = datetime.now()
-            for m, mutant_name, result in mutants:
-                for pid, start_time in m.start_time_by_pid.items():
+            now = monotonic()
+            # Only the running pids need checking, and they're per file, so don't go through every mutant
+            for m in source_file_mutation_data_by_path.values():
+                # The main thread adds and removes pids as we go
+                for pid, start_time in list(m.start_time_by_pid.items()):
                     run_time = now - start_time
-                    if run_time.total_seconds() > (m.estimated_time_of_tests_by_mutant[mutant_name] + 1) * 4:
+                    if run_time > (m.estimated_time_of_tests_by_pid[pid] + 1) * 4:
                         try:
                             os.kill(pid, signal.SIGXCPU)
                         except ProcessLookupError:
@@ -1208,6 +1603,318 @@ def timeout_checker(mutants):
     return inner_timout_checker
 
 
+def setup_source_paths():
+    src_path = (Path('mutants') / 'src')
+    source_path = (Path('mutants') / 'source')
+    if src_path.exists():
+        path = str(src_path.absolute())
+    elif source_path.exists():
+        path = str(source_path.absolute())
+    else:
+        path = os.path.abspath('mutants')
+
+    # Put it first, dropping any other occurrences in the same pass
+    sys.path[:] = [path] + [x for x in sys.path if x != path]
+
+
+def fastest_tests_first_for_mutant(mutant_name):
+    return fastest_tests_first_for_function(mangled_name_from_mutant_name(mutant_name))
+
+
+@lru_cache(maxsize=None)
+def fastest_tests_first_for_function(mangled_name):
+    # The stats don't change once mutation testing has started. run calls this for all mutants before forking,
+    # so each function's tests are sorted once, in the parent, and not again in every child.
+    tests = mutmut.tests_by_mangled_function_name.get(mangled_name, ())
+    return tuple(sorted(tests, key=mutmut.duration_by_test.__getitem__))
+
+
+def run_mutant_in_child(*, runner, m, mutant_name):
+    gc.enable()
+    os.environ['MUTANT_UNDER_TEST'] = mutant_name
+    setproctitle(f'mutmut: {mutant_name}')
+
+    tests = fastest_tests_first_for_mutant(mutant_name)
+    if not tests:
+        os._exit(33)
+
+    estimated_time_of_tests = m.estimated_time_of_tests_by_mutant[mutant_name]
+    cpu_time_limit = ceil((estimated_time_of_tests + 1) * 2 + process_time()) * 10
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_time_limit, cpu_time_limit))
+
+    with CatchOutput(max_strings=1000):
+        result = runner.run_tests(mutant_name=mutant_name, tests=tests)
+
+    if result != 0:
+        # TODO: write failure information to stdout?
+        pass
+    os._exit(result)
+
+
+class Worker:
+    def __init__(self, *, pid, conn, tests):
+        self.pid = pid
+        self.conn = conn
+        self.queue = deque()
+        self.tests = tests
+        # Set when the worker tells us it has collected the tests
+        self.collected = False
+        # A worker that forks for each mutant is never affected by the mutants it ran, so it can live for the whole run
+        self.jobs_left = None if mutmut.config.mutants_per_child == 1 else mutmut.config.mutants_per_child
+
+
+def run_worker(*, runner, conn, tests):
+    gc.enable()
+    setproctitle('mutmut: worker')
+    fork_per_mutant = mutmut.config.mutants_per_child == 1
+    shut_down = False
+    mutant_pid = None
+    mutant_name = None
+    killed_by_w = None
+    # Mutants of a function are often killed by the same test, so the next one runs the last killer first. Only kept
+    # for this worker's run: which test kills depends on the mutant, so it's an ordering hint, not a result.
+    killer_by_mangled_name = {}
+
+    def forward_signal(signum, frame):
+        unused(frame)
+        # The parent only knows the worker's pid, so a timeout kill has to be passed on to the mutant being tested
+        if mutant_pid is not None:
+            try:
+                os.kill(mutant_pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def report_result(exit_code, killed_by=None):
+        if fork_per_mutant:
+            # We're in the process forked for this mutant, the worker reads the exit code and the killer
+            if killed_by is not None:
+                os.write(killed_by_w, killed_by.encode())
+            os._exit(exit_code)
+        if killed_by is not None:
+            killer_by_mangled_name[mangled_name_from_mutant_name(mutant_name)] = killed_by
+        conn.send(exit_code)
+
+    def jobs():
+        nonlocal shut_down, mutant_pid, mutant_name, killed_by_w
+        # We only get here once the tests are collected. If the worker exits before saying so, the parent knows the
+        # collection failed, and doesn't blame the mutants it sent.
+        conn.send(True)
+        while True:
+            job = conn.recv()
+            if job is None:
+                shut_down = True
+                return
+            # The worker is forked after the stats are loaded, so only the mutant name needs to be sent over
+            mutant_name, estimated_time_of_tests = job
+
+            if fork_per_mutant:
+                killed_by_r, killed_by_w = os.pipe()
+                # The tests are collected already, so the forked process goes straight to running them
+                mutant_pid = os.fork()
+                if mutant_pid:
+                    os.close(killed_by_w)
+                    _, wait_status = os.waitpid(mutant_pid, 0)
+                    mutant_pid = None
+                    # Don't wait for EOF: a process the tests started could still have the pipe open. The mutant has
+                    # exited, so what it wrote is there already.
+                    os.set_blocking(killed_by_r, False)
+                    try:
+                        killed_by = os.read(killed_by_r, 65536).decode()
+                    except BlockingIOError:
+                        killed_by = ''
+                    os.close(killed_by_r)
+                    if killed_by:
+                        killer_by_mangled_name[mangled_name_from_mutant_name(mutant_name)] = killed_by
+                    conn.send(os.waitstatus_to_exitcode(wait_status))
+                    continue
+                os.close(killed_by_r)
+                signal.signal(signal.SIGXCPU, signal.SIG_DFL)
+
+            setproctitle(f'mutmut: {mutant_name}')
+
+            # A worker lives on between jobs, so the limit is on top of the CPU time it has used so far
+            cpu_time_limit = ceil(process_time() + (estimated_time_of_tests + 1) * 20)
+            # The soft limit can't go above a hard limit we were started with
+            _, cpu_time_hard_limit = resource.getrlimit(resource.RLIMIT_CPU)
+            if cpu_time_hard_limit != resource.RLIM_INFINITY:
+                cpu_time_limit = min(cpu_time_limit, cpu_time_hard_limit)
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_time_limit, cpu_time_hard_limit))
+            tests_of_mutant = fastest_tests_first_for_mutant(mutant_name)
+            killer = killer_by_mangled_name.get(mangled_name_from_mutant_name(mutant_name))
+            if killer is not None:
+                tests_of_mutant = (killer,) + tuple(x for x in tests_of_mutant if x != killer)
+            yield mutant_name, tests_of_mutant
+
+            if fork_per_mutant:
+                # The runner asked for the next mutant without reporting a result for this one
+                os._exit(35)
+
+    if fork_per_mutant:
+        signal.signal(signal.SIGXCPU, forward_signal)
+
+    try:
+        # Workers run many mutants, and would otherwise keep the output of all of them
+        with CatchOutput(max_strings=1000):
+            runner.run_tests_in_worker(tests=tests, jobs=jobs(), report_result=report_result)
+    finally:
+        # If we stopped without being told to, the job we were on is suspicious
+        os._exit(0 if shut_down else 35)
+
+
+def run_mutants_in_workers(*, runner, mutants_to_run, max_children, source_file_mutation_data_by_path):
+    # Every worker collects all the tests we need once. Then it forks for each mutant, or with mutants_per_child > 1,
+    # runs mutants in its own process until it has done mutants_per_child of them.
+    tests = sorted(tests_for_mutant_names([mutant_name for _, mutant_name in mutants_to_run]))
+    mutants_left = deque(mutants_to_run)
+    worker_by_conn: Dict[Connection, Worker] = {}
+    count_tried = 0
+    # Set when the workers can't collect the tests at all. The mutants they didn't get to are handed back to the caller.
+    give_up = False
+
+    # Workers that run mutants in-process get a second mutant queued, so they can go on with it while we handle the
+    # result of the first. Forking workers don't, since a timeout kill meant for one mutant could then hit the next one.
+    queue_length = 1 if mutmut.config.mutants_per_child == 1 else 2
+
+    def start_worker():
+        parent_conn, child_conn = Pipe()
+        pid = os.fork()
+        if not pid:
+            # In the worker. Close the connections to the other workers, so they notice if the parent goes away.
+            parent_conn.close()
+            for conn in worker_by_conn:
+                conn.close()
+            run_worker(runner=runner, conn=child_conn, tests=tests)
+        child_conn.close()
+        worker_by_conn[parent_conn] = Worker(pid=pid, conn=parent_conn, tests=tests)
+
+    def stop_worker(worker):
+        del worker_by_conn[worker.conn]
+        try:
+            worker.conn.send(None)
+        except ConnectionError:
+            pass
+        worker.conn.close()
+        os.waitpid(worker.pid, 0)
+
+    def start_job(worker, start_time=None):
+        # The first mutant in the queue is the one the worker is running now
+        m, mutant_name = worker.queue[0]
+        m.register_pid(pid=worker.pid, key=mutant_name, estimated_time_of_tests=m.estimated_time_of_tests_by_mutant[mutant_name], start_time=start_time)
+
+    def send_jobs(worker):
+        while mutants_left and len(worker.queue) < queue_length and worker.jobs_left != 0:
+            m, mutant_name = mutants_left.popleft()
+            worker.queue.append((m, mutant_name))
+            if worker.jobs_left is not None:
+                worker.jobs_left -= 1
+            try:
+                worker.conn.send((mutant_name, m.estimated_time_of_tests_by_mutant[mutant_name]))
+            except ConnectionError:
+                # The worker is already dead, read_results() will pick that up
+                pass
+            if len(worker.queue) == 1 and worker.collected:
+                start_job(worker)
+
+    def collection_failed(worker):
+        nonlocal tests, give_up
+        # None of the jobs sent to the worker ran, so they go back in line
+        mutants_left.extendleft(reversed(worker.queue))
+        worker.queue.clear()
+        if worker.tests is not tests:
+            # Started before we dealt with it, the other workers fail the same way
+            return
+
+        # Most likely a test in the stats is gone, and pytest refuses to run when asked for a test it can't find. If
+        # so, drop those and start over, instead of failing every mutant the workers are sent.
+        os.environ['MUTANT_UNDER_TEST'] = 'list_all_tests'
+        try:
+            with CatchOutput():
+                all_tests_result = runner.list_all_tests()
+        except CollectTestsFailedException:
+            all_tests_result = None
+        os.environ['MUTANT_UNDER_TEST'] = ''
+        if all_tests_result is None or all_tests_result.ids.issuperset(tests):
+            # Nothing we can fix here, the caller runs the rest the slow way, with a fresh pytest for each mutant
+            give_up = True
+            return
+        all_tests_result.clear_out_obsolete_test_names()
+        fastest_tests_first_for_function.cache_clear()
+        tests = sorted(tests_for_mutant_names([mutant_name for _, mutant_name in mutants_to_run]))
+
+    def read_results():
+        nonlocal count_tried
+        ready = wait(list(worker_by_conn))
+        # A worker goes on with its queued mutant as soon as it has sent a result, not when we get around to reading
+        # it. Close enough to when that was, so the mutant isn't charged for the time we spend on the other workers.
+        received_time = monotonic()
+        for conn in ready:
+            worker = worker_by_conn[conn]
+            if not worker.collected:
+                # The first thing a worker sends is that it has collected the tests
+                try:
+                    worker.collected = conn.recv()
+                except (EOFError, ConnectionError):
+                    del worker_by_conn[conn]
+                    conn.close()
+                    os.waitpid(worker.pid, 0)
+                    collection_failed(worker)
+                    continue
+                # Collecting isn't part of the time a mutant gets
+                if worker.queue:
+                    start_job(worker, start_time=received_time)
+                continue
+
+            try:
+                exit_code = conn.recv()
+            except (EOFError, ConnectionError):
+                # The worker died, most likely because it was killed for taking too long. If it died with a job
+                # we sent still unread, the socket is reset instead of closed.
+                del worker_by_conn[conn]
+                conn.close()
+                _, wait_status = os.waitpid(worker.pid, 0)
+                exit_code = os.waitstatus_to_exitcode(wait_status)
+                alive = False
+            else:
+                alive = True
+            if mutmut.config.debug:
+                print('    worker exit code', exit_code)
+
+            m, mutant_name = worker.queue.popleft()
+            m.register_result(pid=worker.pid, exit_code=exit_code)
+            count_tried += 1
+            if not alive:
+                # Mutants queued behind the one it died on go to another worker
+                mutants_left.extendleft(reversed(worker.queue))
+                worker.queue.clear()
+            elif worker.queue:
+                start_job(worker, start_time=received_time)
+            print_stats(source_file_mutation_data_by_path)
+
+    try:
+        while (mutants_left and not give_up) or worker_by_conn:
+            while mutants_left and not give_up and len(worker_by_conn) < max_children:
+                start_worker()
+
+            for worker in list(worker_by_conn.values()):
+                send_jobs(worker)
+                if not worker.queue:
+                    # Out of mutants to run, or used up: replace it, so whatever state a mutant leaves behind can only
+                    # affect a few other mutants
+                    stop_worker(worker)
+
+            if worker_by_conn:
+                read_results()
+    finally:
+        # Only workers that didn't get to finish, like when the user stops the run, are left here
+        for worker in worker_by_conn.values():
+            try:
+                os.kill(worker.pid, SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    return count_tried, list(mutants_left)
+
+
 @cli.command()
 @click.option('--max-children', type=int)
 @click.argument('mutant_names', required=False, nargs=-1)
@@ -1219,23 +1926,16 @@ def run(mutant_names, *, max_children):
     os.environ['MUTANT_UNDER_TEST'] = 'mutant_generation'
     read_config()
 
-    start = datetime.now()
+    start = monotonic()
     makedirs(Path('mutants'), exist_ok=True)
     with CatchOutput(spinner_title='Generating mutants'):
-        create_mutants()
+        create_mutants(max_children=max_children)
         copy_also_copy_files()
 
-    time = datetime.now() - start
-    print(f'    done in {round(time.total_seconds()*1000)}ms', )
+    time = monotonic() - start
+    print(f'    done in {round(time*1000)}ms', )
 
-    src_path = (Path('mutants') / 'src')
-    source_path = (Path('mutants') / 'source')
-    if src_path.exists():
-        sys.path.insert(0, str(src_path.absolute()))
-    elif source_path.exists():
-        sys.path.insert(0, str(source_path.absolute))
-    else:
-        sys.path.insert(0, os.path.abspath('mutants'))
+    setup_source_paths()
 
     # TODO: config/option for runner
     # runner = HammettRunner()
@@ -1248,6 +1948,11 @@ def run(mutant_names, *, max_children):
 
     mutants, source_file_mutation_data_by_path = collect_source_file_mutation_data(mutant_names=mutant_names)
 
+    # A run that was killed leaves its journal behind. Fold it in now, so journals don't keep growing over such runs
+    for m in source_file_mutation_data_by_path.values():
+        if m.journal_path.exists():
+            m.save()
+
     os.environ['MUTANT_UNDER_TEST'] = ''
     with CatchOutput(spinner_title='Running clean tests') as output_catcher:
         tests = tests_for_mutant_names(mutant_names)
@@ -1260,92 +1965,107 @@ def run(mutant_names, *, max_children):
     print('    done')
 
     # this can't be the first thing, because it can fail deep inside pytest/django setup and then everything is destroyed
-    run_forced_fail(runner)
+    # Only the tests we just ran are needed, they all call mutated code, so collecting the whole test suite again is wasted
+    run_forced_fail(runner, tests)
 
     runner.prepare_main_test_run()
 
     def read_one_child_exit_status():
+        # os.wait() returns for whichever child exits first, so a slow mutant doesn't hold up starting the next one
         pid, wait_status = os.wait()
         exit_code = os.waitstatus_to_exitcode(wait_status)
         if mutmut.config.debug:
             print('    worker exit code', exit_code)
         source_file_mutation_data_by_pid[pid].register_result(pid=pid, exit_code=exit_code)
 
+    def start_child(m, mutant_name):
+        nonlocal running_children, count_tried
+
+        pid = os.fork()
+        if not pid:
+            # In the child
+            run_mutant_in_child(runner=runner, m=m, mutant_name=mutant_name)
+        else:
+            # in the parent
+            source_file_mutation_data_by_pid[pid] = m
+            m.register_pid(pid=pid, key=mutant_name, estimated_time_of_tests=m.estimated_time_of_tests_by_mutant[mutant_name])
+            running_children += 1
+
+        if running_children >= max_children:
+            read_one_child_exit_status()
+            count_tried += 1
+            running_children -= 1
+
     source_file_mutation_data_by_pid: Dict[int, SourceFileMutationData] = {}  # many pids map to one MutationData
+    mutants_to_run = []
     running_children = 0
     if max_children is None:
         max_children = os.cpu_count() or 4
 
     count_tried = 0
 
+    # Calculate times of tests. The mangled names are kept in step with mutants, for the tests lookup below.
+    estimates = []
+    mangled_names = []
+    for m, mutant_name, result in mutants:
+        mangled_name = mangled_name_from_mutant_name(mutant_name)
+        estimated_time_of_tests = estimated_worst_case_time_for_function(mangled_name)
+        m.estimated_time_of_tests_by_mutant[mutant_name] = estimated_time_of_tests
+        estimates.append(estimated_time_of_tests)
+        mangled_names.append(mangled_name)
+
     # Run estimated fast mutants first, calculated as the estimated time for a surviving mutant.
-    mutants = sorted(mutants, key=lambda x: estimated_worst_case_time(x[1]))
+    order = sorted(range(len(mutants)), key=estimates.__getitem__)
+    mutants = [mutants[i] for i in order]
+    mangled_names = [mangled_names[i] for i in order]
+
+    stop_journal_flusher = Event()
+    journal_flusher_thread = Thread(target=journal_flusher(source_file_mutation_data_by_path, stop_journal_flusher), daemon=True)
 
+    # Everything the children need is built by now. Move it out of the GC's reach and keep the GC from running in the
+    # parent while we fork, so it doesn't touch the objects and make the kernel copy the pages for every child.
+    gc.collect()
     gc.freeze()
+    gc.disable()
 
-    start = datetime.now()
+    start = monotonic()
     try:
         print('Running mutation testing')
 
-        # Calculate times of tests
-        for m, mutant_name, result in mutants:
-            mutant_name = mutant_name.replace('__init__.', '')
-            tests = mutmut.tests_by_mangled_function_name.get(mangled_name_from_mutant_name(mutant_name), [])
-            estimated_time_of_tests = sum(mutmut.duration_by_test[test_name] for test_name in tests)
-            m.estimated_time_of_tests_by_mutant[mutant_name] = estimated_time_of_tests
-
-        Thread(target=timeout_checker(mutants), daemon=True).start()
+        Thread(target=timeout_checker(source_file_mutation_data_by_path), daemon=True).start()
+        journal_flusher_thread.start()
 
         # Now do mutation
-        for m, mutant_name, result in mutants:
+        for (m, mutant_name, result), mangled_name in zip(mutants, mangled_names):
             print_stats(source_file_mutation_data_by_path)
 
-            mutant_name = mutant_name.replace('__init__.', '')
-
             # Rerun mutant if it's explicitly mentioned, but otherwise let the result stand
             if not mutant_names and result is not None:
                 continue
 
-            tests = mutmut.tests_by_mangled_function_name.get(mangled_name_from_mutant_name(mutant_name), [])
+            tests = mutmut.tests_by_mangled_function_name.get(mangled_name, [])
 
             # print(tests)
             if not tests:
-                m.exit_code_by_key[mutant_name] = 33
-                m.save()
+                m.register_exit_code(key=mutant_name, exit_code=33)
                 continue
 
-            pid = os.fork()
-            if not pid:
-                # In the child
-                os.environ['MUTANT_UNDER_TEST'] = mutant_name
-                setproctitle(f'mutmut: {mutant_name}')
-
-                # Run fast tests first
-                tests = sorted(tests, key=lambda test_name: mutmut.duration_by_test[test_name])
-                if not tests:
-                    os._exit(33)
-
-                estimated_time_of_tests = m.estimated_time_of_tests_by_mutant[mutant_name]
-                cpu_time_limit = ceil((estimated_time_of_tests + 1) * 2 + process_time()) * 10
-                resource.setrlimit(resource.RLIMIT_CPU, (cpu_time_limit, cpu_time_limit))
-
-                with CatchOutput():
-                    result = runner.run_tests(mutant_name=mutant_name, tests=tests)
-
-                if result != 0:
-                    # TODO: write failure information to stdout?
-                    pass
-                os._exit(result)
+            if runner.supports_workers:
+                mutants_to_run.append((m, mutant_name))
             else:
-                # in the parent
-                source_file_mutation_data_by_pid[pid] = m
-                m.register_pid(pid=pid, key=mutant_name, estimated_time_of_tests=estimated_time_of_tests)
-                running_children += 1
-
-            if running_children >= max_children:
-                read_one_child_exit_status()
-                count_tried += 1
-                running_children -= 1
+                start_child(m, mutant_name)
+
+        if mutants_to_run:
+            count_tried_in_workers, mutants_not_run = run_mutants_in_workers(
+                runner=runner,
+                mutants_to_run=mutants_to_run,
+                max_children=max_children,
+                source_file_mutation_data_by_path=source_file_mutation_data_by_path,
+            )
+            count_tried += count_tried_in_workers
+            # Left over when the workers couldn't collect the tests
+            for m, mutant_name in mutants_not_run:
+                start_child(m, mutant_name)
 
         try:
             while running_children:
@@ -1357,12 +2077,23 @@ def run(mutant_names, *, max_children):
     except KeyboardInterrupt:
         print('Stopping...')
         stop_all_children(mutants)
+    finally:
+        gc.enable()
+
+    if journal_flusher_thread.is_alive():
+        stop_journal_flusher.set()
+        journal_flusher_thread.join()
 
-    t = datetime.now() - start
+    # Fold the result journals back into the meta files
+    for m in source_file_mutation_data_by_path.values():
+        if m.journal is not None:
+            m.save()
+
+    t = monotonic() - start
 
     print_stats(source_file_mutation_data_by_path, force_output=True)
     print()
-    print(f'{count_tried / t.total_seconds():.2f} mutations/second')
+    print(f'{count_tried / t:.2f} mutations/second')
 
     if mutant_names:
         print()
@@ -1374,34 +2105,49 @@ def run(mutant_names, *, max_children):
             exit_code_by_key[mutant_name] = m.exit_code_by_key[mutant_name]
 
         for mutant_name, exit_code in sorted(exit_code_by_key.items()):
-            print(emoji_by_status.get(status_by_exit_code.get(exit_code), '?'), mutant_name)
+            print(exit_code_to_emoji.get(exit_code, emoji_by_status['suspicious']), mutant_name)
 
         print()
 
 
 def tests_for_mutant_names(mutant_names):
-    tests = set()
+    # Mutants of the same function have the same tests, so look each function up once
+    mangled_names = set()
+    patterns = []
     for mutant_name in mutant_names:
-        if '*' in mutant_name:
-            for name, tests_of_this_name in mutmut.tests_by_mangled_function_name.items():
-                if fnmatch.fnmatch(name, mutant_name):
-                    tests |= set(tests_of_this_name)
+        if has_fnmatch_wildcards(mutant_name):
+            patterns.append(mutant_name)
         else:
-            tests |= set(mutmut.tests_by_mangled_function_name[mangled_name_from_mutant_name(mutant_name)])
-    return tests
+            mangled_names.add(mangled_name_from_mutant_name(mutant_name))
+
+    # Checked first, so looking up a function without tests doesn't add an empty entry to the defaultdict
+    test_sets = [
+        mutmut.tests_by_mangled_function_name[name]
+        for name in mangled_names
+        if name in mutmut.tests_by_mangled_function_name
+    ]
+
+    if patterns:
+        # One pass over the functions for all the patterns
+        pattern_match = compile_fnmatch_patterns(patterns)
+        test_sets += [
+            tests_of_this_name
+            for name, tests_of_this_name in mutmut.tests_by_mangled_function_name.items()
+            if pattern_match(name)
+        ]
+    return set().union(*test_sets)
 
 
 @cli.command()
 @click.option('--all', default=False)
 def results(all):
     read_config()
-    for path in walk_source_files():
+    for path in list_source_files():
         if not str(path).endswith('.py'):
             continue
-        m = SourceFileMutationData(path=path)
-        m.load()
+        m = read_source_file_mutation_data(path)
         for k, v in m.exit_code_by_key.items():
-            status = status_by_exit_code[v]
+            status = status_by_exit_code.get(v, 'suspicious')
             if status == 'killed' and not all:
                 continue
             print(f'    {k}: {status}')
@@ -1417,46 +2163,84 @@ def read_orig_ast(path):
         return parse(f.read())
 
 
-def find_ast_node(ast, function_name, orig_function_name):
-    function_name = function_name.rpartition('.')[-1]
-    orig_function_name = orig_function_name.rpartition('.')[-1]
-
+def function_code_by_name(ast):
+    # Collected as code, not nodes, so a cached result can't be changed by the caller. The code is split around the
+    # function name, so it can be put back together with the original name, however the def is spaced.
+    result = {}
     for node in ast.children:
         if node.type == 'classdef':
             (body,) = [x for x in node.children if x.type == 'suite']
-            result = find_ast_node(body, function_name=function_name, orig_function_name=orig_function_name)
-            if result:
-                return result
-        if node.type == 'funcdef' and node.name.value == function_name:
-            node.name.value = orig_function_name
-            return node
+            for function_name, code in function_code_by_name(body).items():
+                result.setdefault(function_name, code)
+        if node.type == 'funcdef':
+            def_keyword, name, *rest = node.children
+            assert name is node.name
+            result.setdefault(name.value, (
+                def_keyword.get_code() + name.prefix,
+                ''.join(x.get_code() for x in rest),
+            ))
+    return result
+
 
+@lru_cache(maxsize=16)
+def read_mutants_function_code_by_name(path, mtime_ns):
+    # browse shows the diff of each mutant the cursor moves over, so parse each file once, not once per mutant
+    unused(mtime_ns)  # Only part of the cache key, so a changed file is parsed again
+    return function_code_by_name(read_mutants_ast(path))
 
-def read_original_ast_node(ast, mutant_name):
+
+def read_function_code(code_by_function_name, function_name, orig_function_name):
+    function_name = function_name.rpartition('.')[-1]
+    orig_function_name = orig_function_name.rpartition('.')[-1]
+
+    code = code_by_function_name.get(function_name)
+    if code is None:
+        return None
+    before_name, after_name = code
+    return before_name + orig_function_name + after_name
+
+
+def read_original_function_code(code_by_function_name, mutant_name):
     orig_function_name, class_name = orig_function_and_class_names_from_key(mutant_name)
     orig_name = mangled_name_from_mutant_name(mutant_name) + '__mutmut_orig'
 
-    result = find_ast_node(ast, function_name=orig_name, orig_function_name=orig_function_name)
-    if not result:
+    result = read_function_code(code_by_function_name, function_name=orig_name, orig_function_name=orig_function_name)
+    if result is None:
         raise FileNotFoundError(f'Could not find original function "{orig_function_name}"')
     return result
 
 
-def read_mutant_ast_node(ast, mutant_name):
+def read_mutant_function_code(code_by_function_name, mutant_name):
     orig_function_name, class_name = orig_function_and_class_names_from_key(mutant_name)
-    result = find_ast_node(ast, function_name=mutant_name, orig_function_name=orig_function_name)
-    if not result:
+    result = read_function_code(code_by_function_name, function_name=mutant_name, orig_function_name=orig_function_name)
+    if result is None:
         raise FileNotFoundError(f'Could not find mutant "{mutant_name}"')
     return result
 
 
+def source_file_path_candidates(mutant_name):
+    # The inverse of how create_mutants_for_file() names mutants: module name + '.' + function name
+    module_parts = mutant_name.rpartition('.')[0].split('.')
+    for root in ('src', '.'):
+        yield Path(root, *module_parts[:-1], module_parts[-1] + '.py')
+        yield Path(root, *module_parts, '__init__.py')
+
+
 def find_mutant(mutant_name):
-    for path in walk_source_files():
+    # Look where the mutant name says the file is first, so we don't need to load every file
+    for path in source_file_path_candidates(mutant_name):
+        if not path.exists() or mutmut.config.should_ignore_for_mutation(path):
+            continue
+
+        m = read_source_file_mutation_data(path)
+        if mutant_name in m.exit_code_by_key:
+            return m
+
+    for path in list_source_files():
         if mutmut.config.should_ignore_for_mutation(path):
             continue
 
-        m = SourceFileMutationData(path=path)
-        m.load()
+        m = read_source_file_mutation_data(path)
         if mutant_name in m.exit_code_by_key:
             return m
 
@@ -1467,24 +2251,25 @@ def get_diff_for_mutant(mutant_name, source=None, path=None):
     if path is None:
         m = find_mutant(mutant_name)
         path = m.path
-        status = status_by_exit_code[m.exit_code_by_key[mutant_name]]
+        status = status_by_exit_code.get(m.exit_code_by_key[mutant_name], 'suspicious')
     else:
         status = 'not checked'
 
     print(f'# {mutant_name}: {status}')
 
     if source is None:
-        ast = read_mutants_ast(path)
+        code_by_function_name = read_mutants_function_code_by_name(str(path), os.stat(Path('mutants') / path).st_mtime_ns)
     else:
-        ast = parse(source, error_recovery=False)
-    orig_code = read_original_ast_node(ast, mutant_name).get_code().strip()
-    mutant_code = read_mutant_ast_node(ast, mutant_name).get_code().strip()
+        code_by_function_name = function_code_by_name(parse(source, error_recovery=False))
+    orig_code = read_original_function_code(code_by_function_name, mutant_name).strip()
+    mutant_code = read_mutant_function_code(code_by_function_name, mutant_name).strip()
+
+    if orig_code == mutant_code:
+        # unified_diff would come up empty too, but only after matching up all the lines
+        return ''
 
     path = str(path)  # difflib requires str, not Path
-    return '\n'.join([
-        line
-        for line in unified_diff(orig_code.split('\n'), mutant_code.split('\n'), fromfile=path, tofile=path, lineterm='')
-    ])
+    return '\n'.join(unified_diff(orig_code.split('\n'), mutant_code.split('\n'), fromfile=path, tofile=path, lineterm=''))
 
 
 @cli.command()
@@ -1513,18 +2298,20 @@ def apply_mutant(mutant_name):
     orig_function_name = orig_function_name.rpartition('.')[-1]
 
     orig_ast = read_orig_ast(path)
-    mutants_ast = read_mutants_ast(path)
-    mutant_ast_node = read_mutant_ast_node(mutants_ast, mutant_name=mutant_name)
-
-    mutant_ast_node.name.value = orig_function_name
-
     for node in orig_ast.children:
         if node.type == 'funcdef' and node.name.value == orig_function_name:
-            node.children = mutant_ast_node.children
             break
     else:
         raise FileNotFoundError(f'Could not apply mutant {mutant_name}')
 
+    # Use the same function index as get_diff_for_mutant(), so applying the mutant you just looked at doesn't parse the mutants file again
+    code_by_function_name = read_mutants_function_code_by_name(str(path), os.stat(Path('mutants') / path).st_mtime_ns)
+    mutant_code = read_mutant_function_code(code_by_function_name, mutant_name)
+    (mutant_ast_node,) = [x for x in parse(mutant_code).children if x.type == 'funcdef']
+    # Named on the parsed node, so it doesn't matter how the def is spaced
+    mutant_ast_node.name.value = orig_function_name
+    node.children = mutant_ast_node.children
+
     with open(path, 'w') as f:
         f.write(orig_ast.get_code())
 
@@ -1593,11 +2380,10 @@ def browse():
             read_config()
             self.source_file_mutation_data_and_stat_by_path = {}
 
-            for p in walk_source_files():
+            for p in list_source_files():
                 if mutmut.config.should_ignore_for_mutation(p):
                     continue
-                source_file_mutation_data = SourceFileMutationData(path=p)
-                source_file_mutation_data.load()
+                source_file_mutation_data = read_source_file_mutation_data(p)
                 stat = collect_stat(source_file_mutation_data)
 
                 self.source_file_mutation_data_and_stat_by_path[str(p)] = source_file_mutation_data, stat
@@ -1627,7 +2413,7 @@ def browse():
                 mutants_table.clear()
                 source_file_mutation_data, stat = self.source_file_mutation_data_and_stat_by_path[event.row_key.value]
                 for k, v in source_file_mutation_data.exit_code_by_key.items():
-                    status = status_by_exit_code[v]
+                    status = status_by_exit_code.get(v, 'suspicious')
                     if status == 'killed':
                         continue
                     mutants_table.add_row(k, emoji_by_status[status], key=k)
@@ -1660,6 +2446,7 @@ def browse():
                 os.system(f'{command} run "{pattern}"')
                 input('press enter to return to browser')
 
+            list_source_files.cache_clear()
             self.read_data()
             self.populate_files_table()
 
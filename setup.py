@@ -65,48 +65,50 @@ class ReleaseCheck(Command):
 
         print("Ok to distribute files")
 
-running_inside_tests = any('pytest' in x[1] or 'hammett' in x[1] for x in inspect.stack())
-
-# NB: _don't_ add namespace_packages to setup(), it'll break
-#     everything using imp.find_module
-setup(
-    name='mutmut',
-    version=read_version(),
-    description='mutation testing for Python 3',
-    long_description='' if running_inside_tests else read_file('README.rst'),
-    author='Anders Hovmöller',
-    author_email='boxed@killingar.net',
-    url='https://github.com/boxed/mutmut',
-    packages=find_packages('.'),
-    package_dir={'': '.'},
-    package_data={
-        'mutmut': ['*.tcss'],
-    },
-    include_package_data=True,
-    license="BSD",
-    zip_safe=False,
-    keywords='mutmut mutant mutation test testing',
-    install_requires=read_reqs('requirements.txt'),
-    classifiers=[
-        'Development Status :: 4 - Beta',
-        'Intended Audience :: Developers',
-        'License :: OSI Approved :: BSD License',
-        'Natural Language :: English',
-        'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.7',
-    ],
-    test_suite='tests',
-    cmdclass={
-        'tag': Tag,
-        'release_check': ReleaseCheck,
-    },
-    # if I add entry_points while pytest runs,
-    # it imports before the coverage collecting starts
-    entry_points={
-        'pytest11': [
-            'mutmut = mutmut.pytestplugin',
+
+if __name__ == '__main__':
+    running_inside_tests = any('pytest' in x[1] or 'hammett' in x[1] for x in inspect.stack())
+
+    # NB: _don't_ add namespace_packages to setup(), it'll break
+    #     everything using imp.find_module
+    setup(
+        name='mutmut',
+        version=read_version(),
+        description='mutation testing for Python 3',
+        long_description='' if running_inside_tests else read_file('README.rst'),
+        author='Anders Hovmöller',
+        author_email='boxed@killingar.net',
+        url='https://github.com/boxed/mutmut',
+        packages=find_packages('.'),
+        package_dir={'': '.'},
+        package_data={
+            'mutmut': ['*.tcss'],
+        },
+        include_package_data=True,
+        license="BSD",
+        zip_safe=False,
+        keywords='mutmut mutant mutation test testing',
+        install_requires=read_reqs('requirements.txt'),
+        classifiers=[
+            'Development Status :: 4 - Beta',
+            'Intended Audience :: Developers',
+            'License :: OSI Approved :: BSD License',
+            'Natural Language :: English',
+            'Programming Language :: Python :: 3',
+            'Programming Language :: Python :: 3.7',
         ],
-    } if running_inside_tests else {
-        'console_scripts': ["mutmut = mutmut.__main__:cli"],
-    },
-)
+        test_suite='tests',
+        cmdclass={
+            'tag': Tag,
+            'release_check': ReleaseCheck,
+        },
+        # if I add entry_points while pytest runs,
+        # it imports before the coverage collecting starts
+        entry_points={
+            'pytest11': [
+                'mutmut = mutmut.pytestplugin',
+            ],
+        } if running_inside_tests else {
+            'console_scripts': ["mutmut = mutmut.__main__:cli"],
+        },
+    )
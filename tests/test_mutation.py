@@ -348,6 +348,28 @@ class Foo:
 '''.strip()
 
 
+def test_diff_ops_with_space_before_parameters():
+    source = """
+def foo (a):
+    return a + 1
+""".strip()
+
+    out = StringIO()
+    mutant_names, hash_by_function_name = write_all_mutants_to_file(out=out, source=source, filename='filename')
+    mutants_source = out.getvalue()
+
+    diff = get_diff_for_mutant(mutant_name=mutant_names[0], source=mutants_source, path='test.py').strip()
+
+    assert diff == '''
+--- test.py
++++ test.py
+@@ -1,2 +1,2 @@
+ def foo (a):
+-    return a + 1
++    return a - 1
+'''.strip()
+
+
 def test_from_future_still_first():
     source = """
 from __future__ import annotations
@@ -1,7 +1,38 @@
+import os
+from collections import defaultdict
+from pathlib import Path
+from signal import (
+    SIGKILL,
+    SIGXCPU,
+)
+from time import sleep
+
+import pytest
 from parso import parse
 
+import mutmut
+import mutmut.__main__
+
 from mutmut.__main__ import (
+    BadTestExecutionCommandsException,
+    CollectTestsFailedException,
+    Config,
+    InvalidConfigException,
+    ListAllTestsResult,
+    SourceFileMutationData,
+    Stat,
+    apply_mutant,
+    calculate_summary_stats,
+    copy_if_changed,
+    create_file_mutants,
+    create_mutants_for_file,
+    fastest_tests_first_for_function,
+    mutants_tests_stamp,
+    read_source_file_mutation_data,
+    run_mutants_in_workers,
+    source_file_path_candidates,
     trampoline_impl,
+    walk_directory,
     yield_from_trampoline_impl,
     yield_mutants_for_module,
 )
@@ -81,3 +112,494 @@ x_foo__mutmut_orig.__name__ = 'x_foo'
     result = ''.join([x[1] for x in yield_mutants_for_module(node, no_mutate_lines=[])])
 
     assert result == expected
+
+
+def test_source_file_mutation_data_journal(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'mutants').mkdir()
+
+    m = SourceFileMutationData(path='foo.py')
+    m.exit_code_by_key = {'foo.x_foo__mutmut_1': None, 'foo.x_foo__mutmut_2': None}
+    m.save()
+
+    m.register_exit_code(key='foo.x_foo__mutmut_1', exit_code=1)
+    m.flush_journal()
+    assert m.journal_path.exists()
+
+    loaded = SourceFileMutationData(path='foo.py')
+    loaded.load()
+    assert loaded.exit_code_by_key == {'foo.x_foo__mutmut_1': 1, 'foo.x_foo__mutmut_2': None}
+
+    m.save()
+    assert not m.journal_path.exists()
+    loaded = SourceFileMutationData(path='foo.py')
+    loaded.load()
+    assert loaded.exit_code_by_key == {'foo.x_foo__mutmut_1': 1, 'foo.x_foo__mutmut_2': None}
+
+
+def test_read_source_file_mutation_data(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'mutants').mkdir()
+
+    m = SourceFileMutationData(path='foo.py')
+    m.exit_code_by_key = {'foo.x_foo__mutmut_1': None}
+    m.save()
+
+    loaded = read_source_file_mutation_data('foo.py')
+    assert loaded.exit_code_by_key == {'foo.x_foo__mutmut_1': None}
+    assert read_source_file_mutation_data('foo.py') is loaded
+
+    m.register_exit_code(key='foo.x_foo__mutmut_1', exit_code=1)
+    m.flush_journal()
+    reloaded = read_source_file_mutation_data('foo.py')
+    assert reloaded is not loaded
+    assert reloaded.exit_code_by_key == {'foo.x_foo__mutmut_1': 1}
+
+
+def test_create_mutants_for_file_keeps_results_of_unchanged_functions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'mutants').mkdir()
+    source_path = Path('foo.py')
+    output_path = Path('mutants') / 'foo.py'
+
+    source_path.write_text('def a():\n    return 1\n\n\ndef b():\n    return 2\n')
+    create_mutants_for_file(source_path, output_path)
+    m = SourceFileMutationData(path=source_path)
+    m.load()
+    assert m.exit_code_by_key == {'foo.x_a__mutmut_1': None, 'foo.x_b__mutmut_1': None}
+    m.register_exit_code(key='foo.x_a__mutmut_1', exit_code=1)
+    m.register_exit_code(key='foo.x_b__mutmut_1', exit_code=0)
+    m.save()
+
+    source_path.write_text('def a():\n    return 1\n\n\ndef b():\n    return 3\n')
+    os.utime(source_path, (0, 0))
+    create_mutants_for_file(source_path, output_path)
+    m = SourceFileMutationData(path=source_path)
+    m.load()
+    assert m.exit_code_by_key == {'foo.x_a__mutmut_1': 1, 'foo.x_b__mutmut_1': None}
+
+
+def test_create_mutants_for_file_mutant_names(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Path('src/pkg').mkdir(parents=True)
+    (tmp_path / 'mutants' / 'src' / 'pkg').mkdir(parents=True)
+
+    for filename, mutant_name in [
+        ('src/pkg/__init__.py', 'pkg.x_a__mutmut_1'),
+        ('src/pkg/my__init__.py', 'pkg.my__init__.x_a__mutmut_1'),
+    ]:
+        source_path = Path(filename)
+        source_path.write_text('def a():\n    return 1\n')
+        create_mutants_for_file(source_path, Path('mutants') / filename)
+        m = SourceFileMutationData(path=source_path)
+        m.load()
+        assert list(m.exit_code_by_key) == [mutant_name]
+
+
+def test_create_mutants_for_file_skips_unchanged_source(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'mutants').mkdir()
+    source_path = Path('foo.py')
+    output_path = Path('mutants') / 'foo.py'
+
+    source_path.write_text('def a():\n    return 1\n')
+    create_mutants_for_file(source_path, output_path)
+    output_path.write_text('# not regenerated\n')
+
+    # touched, but the contents are the same
+    os.utime(source_path, (0, 0))
+    create_mutants_for_file(source_path, output_path)
+    assert output_path.read_text() == '# not regenerated\n'
+    assert os.stat(output_path).st_mtime == os.stat(source_path).st_mtime
+
+
+def test_apply_mutant_with_space_before_parameters(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mutmut, 'config', Config(also_copy=[], do_not_mutate=[], max_stack_depth=-1, debug=False, paths_to_mutate=[], mutants_per_child=1))
+    (tmp_path / 'mutants').mkdir()
+    source_path = Path('foo.py')
+    source_path.write_text('def f (a):\n    return a + 1\n')
+    create_mutants_for_file(source_path, Path('mutants') / 'foo.py')
+
+    apply_mutant('foo.x_f__mutmut_1')
+    assert source_path.read_text() == 'def f (a):\n    return a - 1\n'
+
+
+def test_create_file_mutants_after_do_not_mutate_is_removed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source_path = Path('foo.py')
+    output_path = Path('mutants') / 'foo.py'
+    source_path.write_text('def a():\n    return 1\n')
+
+    monkeypatch.setattr(mutmut, 'config', Config(also_copy=[], do_not_mutate=[], max_stack_depth=-1, debug=False, paths_to_mutate=[], mutants_per_child=1))
+    create_file_mutants(source_path)
+    assert 'x_a__mutmut_1' in output_path.read_text()
+
+    monkeypatch.setattr(mutmut, 'config', Config(also_copy=[], do_not_mutate=['foo.py'], max_stack_depth=-1, debug=False, paths_to_mutate=[], mutants_per_child=1))
+    create_file_mutants(source_path)
+    assert output_path.read_text() == source_path.read_text()
+    assert not Path('mutants/foo.py.meta').exists()
+
+    monkeypatch.setattr(mutmut, 'config', Config(also_copy=[], do_not_mutate=[], max_stack_depth=-1, debug=False, paths_to_mutate=[], mutants_per_child=1))
+    create_file_mutants(source_path)
+    assert 'x_a__mutmut_1' in output_path.read_text()
+    m = SourceFileMutationData(path=source_path)
+    m.load()
+    assert list(m.exit_code_by_key) == ['foo.x_a__mutmut_1']
+
+
+def test_mutants_tests_stamp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(mutmut, 'config', Config(also_copy=[Path('tests/'), Path('setup.cfg')], do_not_mutate=[], max_stack_depth=-1, debug=False, paths_to_mutate=[Path('src')], mutants_per_child=1))
+    (tmp_path / 'mutants' / 'tests').mkdir(parents=True)
+    (tmp_path / 'mutants' / 'src').mkdir()
+    Path('mutants/tests/test_foo.py').write_text('def test_foo():\n    pass\n')
+    Path('mutants/src/foo.py').write_text('')
+    stamp = mutants_tests_stamp()
+
+    # Written by mutmut and by running the tests, not something that changes which tests there are
+    Path('mutants/src/foo.py.meta').write_text('{}')
+    Path('mutants/mutmut-stats.json').write_text('{}')
+    Path('mutants/testreport.xml').write_text('')
+    (tmp_path / 'mutants' / '.pytest_cache').mkdir()
+    Path('mutants/.pytest_cache/README.md').write_text('')
+    (tmp_path / 'mutants' / 'tests' / '__pycache__').mkdir()
+    Path('mutants/tests/__pycache__/test_foo.pyc').write_text('')
+    assert mutants_tests_stamp() == stamp
+
+    Path('mutants/setup.cfg').write_text('[mutmut]\n')
+    assert mutants_tests_stamp() != stamp
+    stamp = mutants_tests_stamp()
+
+    Path('mutants/tests/test_bar.py').write_text('def test_bar():\n    pass\n')
+    assert mutants_tests_stamp() != stamp
+
+
+def test_walk_directory_like_os_walk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Path('src/foo').mkdir(parents=True)
+    Path('src/foo/a.py').write_text('')
+    Path('src/b.py').write_text('')
+    Path('other').mkdir()
+    Path('other/c.py').write_text('')
+    Path('src/linked').symlink_to(tmp_path / 'other', target_is_directory=True)
+    Path('src/linked.py').symlink_to(tmp_path / 'other' / 'c.py')
+
+    expected = sorted(
+        (root, filename)
+        for root, dirs, files in os.walk('src')
+        for filename in files
+    )
+    assert sorted(walk_directory('src')) == expected
+    assert ('src', 'linked') not in expected
+    assert ('src', 'linked.py') in expected
+
+
+def test_source_file_path_candidates():
+    assert list(source_file_path_candidates('foo.bar.x_baz__mutmut_1')) == [
+        Path('src/foo/bar.py'),
+        Path('src/foo/bar/__init__.py'),
+        Path('foo/bar.py'),
+        Path('foo/bar/__init__.py'),
+    ]
+
+
+def test_should_ignore_for_mutation():
+    config = Config(
+        also_copy=[],
+        do_not_mutate=['src/foo/*.py', '*/bar.py'],
+        max_stack_depth=-1,
+        debug=False,
+        paths_to_mutate=[],
+        mutants_per_child=1,
+    )
+    assert config.should_ignore_for_mutation('src/foo/a.py')
+    assert config.should_ignore_for_mutation(Path('src/baz/bar.py'))
+    assert config.should_ignore_for_mutation('src/baz/a.txt')
+    assert not config.should_ignore_for_mutation('src/baz/a.py')
+    assert not config.should_ignore_for_mutation('src/foo.py')
+
+    config = Config(also_copy=[], do_not_mutate=[], max_stack_depth=-1, debug=False, paths_to_mutate=[], mutants_per_child=1)
+    assert not config.should_ignore_for_mutation('src/foo/a.py')
+
+
+@pytest.mark.parametrize('mutants_per_child', [0, -1])
+def test_config_rejects_mutants_per_child_below_1(mutants_per_child):
+    with pytest.raises(InvalidConfigException, match='mutants_per_child'):
+        Config(also_copy=[], do_not_mutate=[], max_stack_depth=-1, debug=False, paths_to_mutate=[], mutants_per_child=mutants_per_child)
+
+
+def test_register_pid_with_start_time():
+    m = SourceFileMutationData(path='a.py')
+    m.register_pid(pid=1, key='a.x_foo__mutmut_1', estimated_time_of_tests=1.0, start_time=12.5)
+    assert m.start_time_by_pid == {1: 12.5}
+    assert m.key_by_pid == {1: 'a.x_foo__mutmut_1'}
+
+
+def test_calculate_summary_stats():
+    a = SourceFileMutationData(path='a.py')
+    a.exit_code_by_key = {'a.x_foo__mutmut_1': 1, 'a.x_foo__mutmut_2': 0, 'a.x_foo__mutmut_3': None}
+    b = SourceFileMutationData(path='b.py')
+    b.exit_code_by_key = {'b.x_foo__mutmut_1': 3, 'b.x_foo__mutmut_2': 33, 'b.x_foo__mutmut_3': 24, 'b.x_foo__mutmut_4': -15}
+
+    assert calculate_summary_stats({'a.py': a, 'b.py': b}) == Stat(
+        not_checked=1,
+        killed=2,
+        survived=1,
+        total=7,
+        no_tests=1,
+        skipped=0,
+        suspicious=1,
+        timeout=1,
+        check_was_interrupted_by_user=0,
+    )
+
+
+def test_copy_if_changed(tmp_path):
+    src = tmp_path / 'src.txt'
+    dst = tmp_path / 'dst.txt'
+    src.write_text('foo')
+
+    copy_if_changed(src, dst)
+    assert dst.read_text() == 'foo'
+
+    # Same size and modification time is considered unchanged
+    dst.write_text('bar')
+    os.utime(dst, ns=(src.stat().st_atime_ns, src.stat().st_mtime_ns))
+    copy_if_changed(src, dst)
+    assert dst.read_text() == 'bar'
+
+    src.write_text('bazz')
+    copy_if_changed(src, dst)
+    assert dst.read_text() == 'bazz'
+
+
+def test_clear_out_obsolete_test_names(monkeypatch):
+    monkeypatch.setattr(mutmut, 'tests_by_mangled_function_name', defaultdict(set, {
+        'foo.x_a': {'test_a', 'test_b'},
+        'foo.x_b': {'test_b', 'test_c'},
+    }))
+    monkeypatch.setattr(mutmut.__main__, 'save_stats', lambda: None)
+
+    ListAllTestsResult(ids={'test_a', 'test_b', 'test_c'}).clear_out_obsolete_test_names()
+    assert mutmut.tests_by_mangled_function_name == {'foo.x_a': {'test_a', 'test_b'}, 'foo.x_b': {'test_b', 'test_c'}}
+
+    ListAllTestsResult(ids={'test_a', 'test_c'}).clear_out_obsolete_test_names()
+    assert mutmut.tests_by_mangled_function_name == {'foo.x_a': {'test_a'}, 'foo.x_b': {'test_c'}}
+
+    ListAllTestsResult(ids={'test_a'}).clear_out_obsolete_test_names()
+    assert mutmut.tests_by_mangled_function_name == {'foo.x_a': {'test_a'}}
+
+
+def test_tests_for_mutant_names(monkeypatch):
+    monkeypatch.setattr(mutmut, 'tests_by_mangled_function_name', defaultdict(set, {
+        'foo.x_a': {'test_a', 'test_b'},
+        'foo.x_b': {'test_b', 'test_c'},
+        'bar.x_c': {'test_d'},
+    }))
+    # Not imported by name: pytest would collect it as a test
+
+    assert mutmut.__main__.tests_for_mutant_names(['foo.x_a__mutmut_1', 'foo.x_a__mutmut_2']) == {'test_a', 'test_b'}
+    assert mutmut.__main__.tests_for_mutant_names(['foo.*']) == {'test_a', 'test_b', 'test_c'}
+    assert mutmut.__main__.tests_for_mutant_names(['bar.x_c__mutmut_1', 'foo.x_b*']) == {'test_b', 'test_c', 'test_d'}
+    assert mutmut.__main__.tests_for_mutant_names(['foo.x_untested__mutmut_1']) == set()
+    assert 'foo.x_untested' not in mutmut.tests_by_mangled_function_name
+
+
+class FakeWorkerRunner(mutmut.__main__.TestRunner):
+    # Runs "tests" in the workers by looking up what each mutant should do, and logs what it was asked to run
+    supports_workers = True
+
+    def __init__(self, *, log_path, outcome_by_mutant, missing_tests=()):
+        self.log_path = log_path
+        self.outcome_by_mutant = outcome_by_mutant
+        self.missing_tests = set(missing_tests)
+
+    def run_tests_in_worker(self, *, tests, jobs, report_result):
+        if self.missing_tests.intersection(tests):
+            # Like pytest, refuse to run anything when asked for a test that isn't there
+            raise BadTestExecutionCommandsException(tests)
+        for mutant_name, tests_of_mutant in jobs:
+            with open(self.log_path, 'a') as f:
+                f.write(f'{os.getpid()} {mutant_name} {" ".join(tests_of_mutant)}\n')
+            outcome = self.outcome_by_mutant[mutant_name]
+            if outcome == 'die':
+                os.kill(os.getpid(), SIGKILL)
+            elif outcome == 'timeout':
+                # What the timeout checker does to the worker
+                os.kill(os.getppid(), SIGXCPU)
+                sleep(10)
+            elif outcome == 'killed':
+                report_result(1, killed_by=tests_of_mutant[-1])
+            else:
+                report_result(0)
+        return 0
+
+    def list_all_tests(self):
+        return ListAllTestsResult(ids=set(mutmut.duration_by_test) - self.missing_tests)
+
+
+@pytest.fixture
+def workers_project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'mutants').mkdir()
+    monkeypatch.setenv('MUTANT_UNDER_TEST', '')
+    monkeypatch.setattr(mutmut, 'tests_by_mangled_function_name', defaultdict(set, {
+        'foo.x_f': {'tests/test_foo.py::test_fast', 'tests/test_foo.py::test_slow'},
+        'foo.x_g': {'tests/test_foo.py::test_fast'},
+    }))
+    monkeypatch.setattr(mutmut, 'duration_by_test', {
+        'tests/test_foo.py::test_fast': 0.1,
+        'tests/test_foo.py::test_slow': 0.2,
+    })
+    monkeypatch.setattr(mutmut, 'stats_time', None)
+    monkeypatch.setattr(mutmut, 'tests_stamp', None)
+    fastest_tests_first_for_function.cache_clear()
+    yield tmp_path
+    fastest_tests_first_for_function.cache_clear()
+
+
+def run_in_workers(*, tmp_path, monkeypatch, mutants_per_child, outcome_by_mutant, max_children=1, runner=None):
+    monkeypatch.setattr(mutmut, 'config', Config(also_copy=[], do_not_mutate=[], max_stack_depth=-1, debug=False, paths_to_mutate=[], mutants_per_child=mutants_per_child))
+    m = SourceFileMutationData(path='foo.py')
+    m.exit_code_by_key = {mutant_name: None for mutant_name in outcome_by_mutant}
+    m.estimated_time_of_tests_by_mutant = {mutant_name: 1.0 for mutant_name in outcome_by_mutant}
+    if runner is None:
+        runner = FakeWorkerRunner(log_path=tmp_path / 'log', outcome_by_mutant=outcome_by_mutant)
+
+    count_tried, mutants_not_run = run_mutants_in_workers(
+        runner=runner,
+        mutants_to_run=[(m, mutant_name) for mutant_name in outcome_by_mutant],
+        max_children=max_children,
+        source_file_mutation_data_by_path={'foo.py': m},
+    )
+    m.save()
+
+    log_path = tmp_path / 'log'
+    log = [line.split(' ') for line in log_path.read_text().splitlines()] if log_path.exists() else []
+    return count_tried, [mutant_name for _, mutant_name in mutants_not_run], m.exit_code_by_key, log
+
+
+@pytest.mark.parametrize('mutants_per_child', [1, 3])
+def test_run_mutants_in_workers(workers_project, monkeypatch, mutants_per_child):
+    outcome_by_mutant = {
+        'foo.x_f__mutmut_1': 'killed',
+        'foo.x_f__mutmut_2': 'survived',
+        'foo.x_g__mutmut_1': 'survived',
+        'foo.x_g__mutmut_2': 'killed',
+    }
+    count_tried, mutants_not_run, exit_code_by_key, log = run_in_workers(
+        tmp_path=workers_project, monkeypatch=monkeypatch, mutants_per_child=mutants_per_child, outcome_by_mutant=outcome_by_mutant, max_children=2)
+
+    assert count_tried == 4
+    assert mutants_not_run == []
+    assert exit_code_by_key == {
+        'foo.x_f__mutmut_1': 1,
+        'foo.x_f__mutmut_2': 0,
+        'foo.x_g__mutmut_1': 0,
+        'foo.x_g__mutmut_2': 1,
+    }
+    assert sorted(mutant_name for _, mutant_name, *_ in log) == sorted(outcome_by_mutant)
+
+
+@pytest.mark.parametrize('mutants_per_child', [1, 3])
+def test_run_mutants_in_workers_runs_last_killer_first(workers_project, monkeypatch, mutants_per_child):
+    count_tried, mutants_not_run, exit_code_by_key, log = run_in_workers(
+        tmp_path=workers_project, monkeypatch=monkeypatch, mutants_per_child=mutants_per_child, outcome_by_mutant={
+            'foo.x_f__mutmut_1': 'killed',
+            'foo.x_f__mutmut_2': 'survived',
+        })
+
+    # The slowest test killed the first mutant, so it goes first for the next one
+    assert [line[1:] for line in log] == [
+        ['foo.x_f__mutmut_1', 'tests/test_foo.py::test_fast', 'tests/test_foo.py::test_slow'],
+        ['foo.x_f__mutmut_2', 'tests/test_foo.py::test_slow', 'tests/test_foo.py::test_fast'],
+    ]
+
+
+@pytest.mark.parametrize('mutants_per_child', [1, 3])
+def test_run_mutants_in_workers_mutant_dies(workers_project, monkeypatch, mutants_per_child):
+    count_tried, mutants_not_run, exit_code_by_key, log = run_in_workers(
+        tmp_path=workers_project, monkeypatch=monkeypatch, mutants_per_child=mutants_per_child, outcome_by_mutant={
+            'foo.x_f__mutmut_1': 'die',
+            'foo.x_f__mutmut_2': 'killed',
+            'foo.x_g__mutmut_1': 'survived',
+        })
+
+    assert count_tried == 3
+    assert exit_code_by_key == {
+        'foo.x_f__mutmut_1': -SIGKILL,
+        'foo.x_f__mutmut_2': 1,
+        'foo.x_g__mutmut_1': 0,
+    }
+    # Each mutant ran once, none of them got lost or ran twice
+    assert [mutant_name for _, mutant_name, *_ in log] == ['foo.x_f__mutmut_1', 'foo.x_f__mutmut_2', 'foo.x_g__mutmut_1']
+
+
+def test_run_mutants_in_workers_requeues_the_queued_job_of_a_dead_worker(workers_project, monkeypatch):
+    # With mutants_per_child > 1 a worker gets a second mutant queued, so it holds foo.x_f__mutmut_2 when it dies
+    count_tried, mutants_not_run, exit_code_by_key, log = run_in_workers(
+        tmp_path=workers_project, monkeypatch=monkeypatch, mutants_per_child=3, outcome_by_mutant={
+            'foo.x_f__mutmut_1': 'die',
+            'foo.x_f__mutmut_2': 'killed',
+        })
+
+    assert exit_code_by_key == {'foo.x_f__mutmut_1': -SIGKILL, 'foo.x_f__mutmut_2': 1}
+    (pid_1, mutant_name_1, *_), (pid_2, mutant_name_2, *_) = log
+    assert (mutant_name_1, mutant_name_2) == ('foo.x_f__mutmut_1', 'foo.x_f__mutmut_2')
+    # Run again by a new worker
+    assert pid_1 != pid_2
+
+
+def test_run_mutants_in_workers_forwards_timeout_to_the_mutant(workers_project, monkeypatch):
+    # A forking worker passes the SIGXCPU it gets from the timeout checker on to the mutant, and goes on with the next one
+    count_tried, mutants_not_run, exit_code_by_key, log = run_in_workers(
+        tmp_path=workers_project, monkeypatch=monkeypatch, mutants_per_child=1, outcome_by_mutant={
+            'foo.x_f__mutmut_1': 'timeout',
+            'foo.x_f__mutmut_2': 'killed',
+        })
+
+    assert exit_code_by_key == {'foo.x_f__mutmut_1': -SIGXCPU, 'foo.x_f__mutmut_2': 1}
+    assert log[0][0] != log[1][0]
+
+
+def test_run_mutants_in_workers_drops_tests_that_are_gone(workers_project, monkeypatch):
+    mutmut.tests_by_mangled_function_name['foo.x_f'].add('tests/test_foo.py::test_gone')
+    mutmut.duration_by_test['tests/test_foo.py::test_gone'] = 0.3
+    # Like run() does when it estimates how long the mutants take
+    fastest_tests_first_for_function('foo.x_f')
+    outcome_by_mutant = {
+        'foo.x_f__mutmut_1': 'killed',
+        'foo.x_g__mutmut_1': 'survived',
+    }
+    runner = FakeWorkerRunner(log_path=workers_project / 'log', outcome_by_mutant=outcome_by_mutant, missing_tests=['tests/test_foo.py::test_gone'])
+    count_tried, mutants_not_run, exit_code_by_key, log = run_in_workers(
+        tmp_path=workers_project, monkeypatch=monkeypatch, mutants_per_child=1, outcome_by_mutant=outcome_by_mutant, runner=runner)
+
+    # Not charged to the mutants
+    assert count_tried == 2
+    assert exit_code_by_key == {'foo.x_f__mutmut_1': 1, 'foo.x_g__mutmut_1': 0}
+    assert mutmut.tests_by_mangled_function_name['foo.x_f'] == {'tests/test_foo.py::test_fast', 'tests/test_foo.py::test_slow'}
+    assert log[0][1:] == ['foo.x_f__mutmut_1', 'tests/test_foo.py::test_fast', 'tests/test_foo.py::test_slow']
+
+
+def test_run_mutants_in_workers_hands_back_mutants_when_collecting_fails(workers_project, monkeypatch):
+    class CantCollectRunner(FakeWorkerRunner):
+        def run_tests_in_worker(self, *, tests, jobs, report_result):
+            raise BadTestExecutionCommandsException(tests)
+
+        def list_all_tests(self):
+            raise CollectTestsFailedException()
+
+    outcome_by_mutant = {
+        'foo.x_f__mutmut_1': 'killed',
+        'foo.x_g__mutmut_1': 'survived',
+    }
+    runner = CantCollectRunner(log_path=workers_project / 'log', outcome_by_mutant=outcome_by_mutant)
+    count_tried, mutants_not_run, exit_code_by_key, log = run_in_workers(
+        tmp_path=workers_project, monkeypatch=monkeypatch, mutants_per_child=1, outcome_by_mutant=outcome_by_mutant, runner=runner)
+
+    # For the caller to run one by one
+    assert count_tried == 0
+    assert mutants_not_run == ['foo.x_f__mutmut_1', 'foo.x_g__mutmut_1']
+    assert exit_code_by_key == {'foo.x_f__mutmut_1': None, 'foo.x_g__mutmut_1': None}